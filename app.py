@@ -19,10 +19,25 @@ Author: Subrat Jain
 import streamlit as st
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
 import plotly.express as px
 import plotly.graph_objects as go
+import hashlib
+import io
 import os
+import re
+import tempfile
+
+from rule_kernel import (
+    RULE_HIGH_AMOUNT, RULE_INTERNATIONAL, RULE_LATE_NIGHT_ONLINE,
+    RULE_VELOCITY, RULE_SUSPICIOUS_MERCHANT, score_rules
+)
+
+# Polars is optional: it is only used to score very large uploads
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:
+    POLARS_AVAILABLE = False
 
 # Page configuration - must be the first Streamlit command
 st.set_page_config(
@@ -108,9 +123,30 @@ st.markdown("""
 # FRAUD DETECTION LOGIC - Rule-Based Scoring System
 # ============================================================================
 
-def calculate_risk_score(row, df):
+# Merchant name keywords for Rule 5, compiled once into a single pattern
+SUSPICIOUS_KEYWORDS = ['unknown', 'suspicious', 'midnight', 'foreign', 'night']
+SUSPICIOUS_MERCHANT_RE = re.compile('|'.join(SUSPICIOUS_KEYWORDS), re.IGNORECASE)
+
+# Datasets with more rows than this evaluate the text rules with Polars
+POLARS_MIN_ROWS = 200_000
+
+# Bump whenever the rules or the columns of a processed dataset change,
+# so previously saved scores are not reused
+RULES_VERSION = "v7"
+
+# Explanation shown for each triggered rule, filled in from the transaction row
+RULE_TEMPLATES = [
+    (RULE_HIGH_AMOUNT, "High amount: ₹{amount_in_inr:,.2f} (> ₹20,000)"),
+    (RULE_INTERNATIONAL, "International transaction detected"),
+    (RULE_LATE_NIGHT_ONLINE, "Late night online transaction at {transaction_datetime:%H}:00 hours"),
+    (RULE_VELOCITY, "Customer has {customer_txn_count} transactions (potential velocity attack)"),
+    (RULE_SUSPICIOUS_MERCHANT, "Suspicious merchant name: {merchant_name}"),
+]
+
+
+def calculate_risk_score(df):
     """
-    Calculate risk score for a transaction based on rule-based scoring.
+    Calculate risk scores for all transactions based on rule-based scoring.
     
     Rules Applied:
     1. High amount (> ₹20,000) → +30 points
@@ -119,82 +155,115 @@ def calculate_risk_score(row, df):
     4. Multiple transactions in short time → +15 points
     5. Uncommon merchant category → +10 points
     
+    The rule inputs are extracted as whole columns and evaluated in a single
+    pass by score_rules (Numba-compiled when available).
+    
     Parameters:
     -----------
-    row : pandas Series
-        Single transaction row
     df : pandas DataFrame
-        Full dataset (for checking transaction patterns)
+        Full dataset with the 'customer_txn_count' column added by
+        process_transactions
     
     Returns:
     --------
-    tuple : (risk_score, triggered_rules)
+    tuple : (risk_scores, rule_mask) with one entry per row, where rule_mask
+            holds the RULE_* bit of every triggered rule
     """
-    risk_score = 0
-    triggered_rules = []
-    
-    # Rule 1: High amount transaction (> ₹20,000)
-    if row['amount_in_inr'] > 20000:
-        risk_score += 30
-        triggered_rules.append(f"High amount: ₹{row['amount_in_inr']:,.2f} (> ₹20,000)")
-    
-    # Rule 2: International transaction
-    if row['is_international'] == True or str(row['is_international']).lower() == 'true':
-        risk_score += 25
-        triggered_rules.append("International transaction detected")
+    amount = df['amount_in_inr'].to_numpy(dtype=np.float64)
+    datetimes = pd.to_datetime(df['transaction_datetime'])
+    hour = datetimes.dt.hour.fillna(0).to_numpy(dtype=np.int64)
+    
+    # Rule 2: International transaction (flagged as True, 1 or the text "true")
+    flags = df['is_international']
+    if pd.api.types.is_bool_dtype(flags):
+        international = flags.to_numpy()
+    elif pd.api.types.is_numeric_dtype(flags):
+        # 0/1 flags; a blank cell parses as NaN and never matches
+        international = (flags == 1).to_numpy()
+    else:
+        international = (flags.eq(True) | (flags.astype(str).str.lower() == 'true')).to_numpy()
     
     # Rule 3: Online transaction during late night hours (00:00 - 04:00)
-    try:
-        if isinstance(row['transaction_datetime'], str):
-            tx_time = datetime.strptime(row['transaction_datetime'], '%Y-%m-%d %H:%M:%S')
-        else:
-            tx_time = row['transaction_datetime']
-        
-        hour = tx_time.hour
-        if row['channel'] == 'Online' and (0 <= hour < 4):
-            risk_score += 20
-            triggered_rules.append(f"Late night online transaction at {hour:02d}:00 hours")
-    except:
-        pass
+    # (a row without a datetime has no hour, so it never matches)
+    online = ((df['channel'] == 'Online') & datetimes.notna()).to_numpy(dtype=bool)
     
     # Rule 4: Multiple transactions by same customer in short time
-    try:
-        customer_id = row['customer_id']
-        customer_txns = df[df['customer_id'] == customer_id]
-        if len(customer_txns) > 3:
-            risk_score += 15
-            triggered_rules.append(f"Customer has {len(customer_txns)} transactions (potential velocity attack)")
-    except:
-        pass
+    customer_txn_count = df['customer_txn_count'].to_numpy(dtype=np.int64)
     
     # Rule 5: Uncommon merchant category or suspicious merchant
-    suspicious_keywords = ['unknown', 'suspicious', 'midnight', 'foreign', 'night']
-    merchant_name = str(row['merchant_name']).lower()
-    if any(keyword in merchant_name for keyword in suspicious_keywords):
-        risk_score += 10
-        triggered_rules.append(f"Suspicious merchant name: {row['merchant_name']}")
+    # (the regex scan dominates scoring time, so large datasets use Polars)
+    if POLARS_AVAILABLE and len(df) > POLARS_MIN_ROWS:
+        suspicious_merchant = suspicious_merchant_mask_polars(df['merchant_name'])
+    else:
+        suspicious_merchant = df['merchant_name'].fillna('').astype(str).str.contains(SUSPICIOUS_MERCHANT_RE).to_numpy(dtype=bool)
+    
+    # Rule 1 (high amount) is checked inside the kernel; scores are capped at 100
+    risk_scores = np.empty(len(df), dtype=np.uint8)
+    rule_mask = np.empty(len(df), dtype=np.uint8)
+    score_rules(amount, international, hour, online, customer_txn_count,
+                suspicious_merchant, risk_scores, rule_mask)
     
-    # Cap the score at 100
-    risk_score = min(risk_score, 100)
+    return risk_scores, rule_mask
+
+
+def suspicious_merchant_mask_polars(merchant_names):
+    """
+    Evaluate Rule 5 with Polars, whose regex engine runs over Arrow strings
+    on all cores. Missing names become null and never match, the same as
+    the empty string used by the pandas path.
+    
+    Returns:
+    --------
+    numpy array : True where the merchant name contains a suspicious keyword
+    """
+    names = pl.Series('merchant_name', merchant_names.tolist(), dtype=pl.String, strict=False)
+    return names.str.contains('(?i)' + SUSPICIOUS_MERCHANT_RE.pattern).fill_null(False).to_numpy()
+
+
+def describe_triggered_rules(txn):
+    """
+    Build the explanation messages for the rules a transaction triggered.
+    Only called for the transaction being viewed, so messages are never
+    formatted for rows the user does not look at.
     
-    return risk_score, triggered_rules
+    Parameters:
+    -----------
+    txn : pandas Series
+        Single processed transaction row
+    
+    Returns:
+    --------
+    list : One message per triggered rule
+    """
+    row = txn.to_dict()
+    return [template.format(**row) for bit, template in RULE_TEMPLATES if txn['rule_mask'] & bit]
+
+
+# Risk labels from lowest to highest, used as the risk_label categories
+RISK_LEVELS = ['Normal', 'Suspicious', 'High Risk']
 
 
-def get_risk_label(risk_score):
+def get_risk_labels(risk_scores):
     """
-    Classify transaction based on risk score.
+    Classify transactions based on their risk scores.
     
     Classification:
     - risk_score >= 70 → "High Risk"
     - 40 <= risk_score < 70 → "Suspicious"
     - risk_score < 40 → "Normal"
+    
+    Parameters:
+    -----------
+    risk_scores : numpy array
+        Risk score per transaction
+    
+    Returns:
+    --------
+    pandas Categorical : Risk label per transaction, over RISK_LEVELS
     """
-    if risk_score >= 70:
-        return "High Risk"
-    elif risk_score >= 40:
-        return "Suspicious"
-    else:
-        return "Normal"
+    # Each threshold crossed moves one step up RISK_LEVELS
+    codes = (risk_scores >= 40).astype(np.int8) + (risk_scores >= 70)
+    return pd.Categorical.from_codes(codes, categories=RISK_LEVELS)
 
 
 def process_transactions(df):
@@ -210,10 +279,13 @@ def process_transactions(df):
     --------
     pandas DataFrame : Processed data with risk scores and labels
     """
-    risk_data = df.apply(lambda row: calculate_risk_score(row, df), axis=1)
-    df['risk_score'] = risk_data.apply(lambda x: x[0])
-    df['triggered_rules'] = risk_data.apply(lambda x: x[1])
-    df['risk_label'] = df['risk_score'].apply(get_risk_label)
+    # Count each customer's transactions once, for the velocity rule
+    df['customer_txn_count'] = df.groupby('customer_id', observed=True)['customer_id'].transform('size').fillna(0).astype(int)
+    
+    risk_scores, rule_mask = calculate_risk_score(df)
+    df['risk_score'] = risk_scores
+    df['rule_mask'] = rule_mask
+    df['risk_label'] = get_risk_labels(risk_scores)
     
     return df
 
@@ -222,6 +294,137 @@ def process_transactions(df):
 # DATA LOADING FUNCTIONS
 # ============================================================================
 
+SAMPLE_DATA_CSV = 'data/transactions_sample_india.csv'
+
+# Parsed copy of the sample CSV. Bump the version whenever
+# read_transactions_csv changes the columns or dtypes it produces.
+SAMPLE_DATA_PARQUET = 'data/transactions_sample_india.v4.parquet'
+
+# Columns the app uses; anything else in a CSV is skipped while parsing
+CSV_COLUMNS = [
+    'transaction_id', 'card_last4', 'transaction_datetime', 'amount_in_inr',
+    'merchant_name', 'merchant_category', 'merchant_city', 'state', 'channel',
+    'is_international', 'is_chip_used', 'customer_id', 'is_fraud'
+]
+
+# Repeated text columns are parsed straight into sorted categories, so
+# filters and group-bys work on integer codes instead of strings. Numeric
+# columns are narrowed afterwards by downcast_columns, which checks values.
+CSV_DTYPES = {
+    'merchant_category': 'category',
+    'merchant_city': 'category',
+    'state': 'category',
+    'channel': 'category',
+    'customer_id': 'category',
+}
+
+# Cache key of the sample dataset, see dataset_key for uploaded files
+SAMPLE_DATASET_KEY = f"sample-{RULES_VERSION}"
+
+# Scored uploads are kept here across restarts (see process_csv_bytes)
+PROCESSED_CACHE_DIR = '.cache'
+
+
+def read_transactions_csv(source):
+    """
+    Read the columns the app uses from a transactions CSV file and parse the
+    datetime and date columns.
+    
+    Parameters:
+    -----------
+    source : str or file-like object
+        Path to the CSV file or an in-memory buffer
+    """
+    df = pd.read_csv(source, usecols=CSV_COLUMNS, dtype=CSV_DTYPES)
+    df['transaction_datetime'] = pd.to_datetime(df['transaction_datetime'])
+    
+    # Calendar day of each transaction, used by the dashboard date filter and
+    # the fraud-over-time chart. Timezone-aware datetimes keep their local
+    # day but drop the zone, so the filter can compare plain datetime64 values.
+    datetimes = df['transaction_datetime']
+    if datetimes.dt.tz is not None:
+        datetimes = datetimes.dt.tz_localize(None)
+    df['date'] = datetimes.dt.normalize()
+    
+    return downcast_columns(df)
+
+
+def downcast_columns(df):
+    """
+    Store numeric and flag columns in the narrowest dtype that holds their
+    values exactly. Each column is checked first and left unchanged if its
+    values do not fit.
+    
+    - card_last4 → uint16 (0-9999)
+    - is_fraud, is_international, is_chip_used → bool (0/1 or True/False)
+    - amount_in_inr → float32 (only if every amount survives to the paisa)
+    """
+    card = df['card_last4']
+    if pd.api.types.is_integer_dtype(card) and card.between(0, 9999).all():
+        df['card_last4'] = card.astype(np.uint16)
+    
+    for column in ['is_fraud', 'is_international', 'is_chip_used']:
+        values = df[column]
+        if pd.api.types.is_numeric_dtype(values) and values.isin([0, 1]).all():
+            df[column] = values.astype(bool)
+    
+    amount = df['amount_in_inr'].to_numpy(dtype=np.float64)
+    amount32 = amount.astype(np.float32)
+    if np.nanmax(np.abs(amount32 - amount), initial=0) < 0.005:
+        df['amount_in_inr'] = amount32
+    
+    return df
+
+
+def write_parquet_atomic(df, path):
+    """
+    Save a DataFrame as Parquet without ever leaving a partial file at path.
+    The data is written to a temporary file in the same directory and then
+    renamed into place, so a crash or a concurrent writer cannot leave a
+    truncated file behind.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.',
+                                    prefix='.tmp-', suffix='.parquet')
+    os.close(fd)
+    try:
+        df.to_parquet(tmp_path, engine='pyarrow', compression='zstd')
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+@st.cache_data
+def load_sample_transactions():
+    """
+    Read and parse the sample Indian transaction dataset (without scoring).
+    Cached separately so that re-scoring does not re-parse the CSV.
+    
+    The parsed data is mirrored to a Parquet file next to the CSV, which
+    keeps the datetime and category dtypes, so later cold starts skip CSV
+    parsing. The mirror is rebuilt whenever the CSV is newer or the mirror
+    cannot be read.
+    """
+    if (os.path.exists(SAMPLE_DATA_PARQUET) and
+            os.path.getmtime(SAMPLE_DATA_PARQUET) >= os.path.getmtime(SAMPLE_DATA_CSV)):
+        try:
+            return pd.read_parquet(SAMPLE_DATA_PARQUET, engine='pyarrow')
+        except (OSError, ValueError):
+            # Unreadable mirror: fall through and rebuild it from the CSV
+            pass
+    
+    df = read_transactions_csv(SAMPLE_DATA_CSV)
+    try:
+        write_parquet_atomic(df, SAMPLE_DATA_PARQUET)
+    except OSError:
+        # Read-only deployment: keep working from the CSV
+        pass
+    return df
+
+
 @st.cache_data
 def load_sample_data():
     """
@@ -229,8 +432,7 @@ def load_sample_data():
     This function is cached for performance.
     """
     try:
-        df = pd.read_csv('data/transactions_sample_india.csv')
-        df['transaction_datetime'] = pd.to_datetime(df['transaction_datetime'])
+        df = load_sample_transactions()
         df = process_transactions(df)
         return df
     except Exception as e:
@@ -238,6 +440,150 @@ def load_sample_data():
         return None
 
 
+def dataset_key(data):
+    """
+    Cache key for an uploaded file: a hash of RULES_VERSION and the file
+    contents, so the key changes whenever the scores would.
+    """
+    return hashlib.blake2b(RULES_VERSION.encode() + data, digest_size=16).hexdigest()
+
+
+@st.cache_data
+def process_csv_bytes(df_key, _data):
+    """
+    Parse and score an uploaded CSV file.
+    Cached on the dataset key (see dataset_key) rather than on the bytes,
+    so Streamlit does not hash the whole upload again for the lookup.
+    
+    Parameters:
+    -----------
+    df_key : str
+        dataset_key of the file contents
+    _data : bytes
+        Raw contents of the uploaded file
+    
+    The scored result is also saved as Parquet under PROCESSED_CACHE_DIR,
+    named by the dataset key, so the same file is not scored again after
+    a server restart. An unreadable saved file is simply scored again.
+    """
+    path = os.path.join(PROCESSED_CACHE_DIR, f"{df_key}.parquet")
+    if os.path.exists(path):
+        try:
+            return pd.read_parquet(path, engine='pyarrow')
+        except (OSError, ValueError):
+            pass
+    
+    df = read_transactions_csv(io.BytesIO(_data))
+    df = process_transactions(df)
+    try:
+        os.makedirs(PROCESSED_CACHE_DIR, exist_ok=True)
+        write_parquet_atomic(df, path)
+    except OSError:
+        pass
+    return df
+
+
+def get_active_dataset():
+    """
+    Return the dataset the pages should show, with its cache key: the
+    uploaded file if there is one, otherwise the sample dataset.
+    """
+    if 'custom_data' in st.session_state:
+        return st.session_state['custom_data'], st.session_state['custom_data_key']
+    return load_sample_data(), SAMPLE_DATASET_KEY
+
+
+def total_amount(df):
+    """
+    Sum of amount_in_inr, accumulated in float64 so totals stay exact to
+    the paisa even when the column is stored as float32.
+    """
+    return df['amount_in_inr'].to_numpy().sum(dtype=np.float64)
+
+
+# ============================================================================
+# FILTERING FUNCTIONS
+# ============================================================================
+
+def filter_options(df, column):
+    """
+    Options for a filter dropdown: 'All' followed by the column's values.
+    Read from the (already sorted) categories, so the data is not scanned.
+    """
+    return ['All'] + df[column].cat.categories.tolist()
+
+
+def filter_transactions(df, state='All', city='All', channel='All', risk='All',
+                        search='', date_range=None):
+    """
+    Select the transactions matching the page filters.
+    
+    All active filters are combined into one boolean mask, so the data is
+    copied once no matter how many filters are set. Every comparison runs
+    on category codes or datetime64 values, which keeps the mask cheap
+    even for large uploads.
+    
+    Parameters:
+    -----------
+    df : pandas DataFrame
+        Processed transaction data
+    state, city, channel, risk : str
+        Selected filter values, 'All' disables the filter
+    search : str
+        Text to look for in the transaction ID or merchant name
+    date_range : sequence of two dates, optional
+        Inclusive start and end date
+    
+    Returns:
+    --------
+    pandas DataFrame : Matching transactions
+    """
+    mask = np.ones(len(df), dtype=bool)
+    
+    if date_range is not None and len(date_range) == 2:
+        # The precomputed datetime64 'date' column avoids creating a Python
+        # date object for every row
+        dates = df['date'].to_numpy()
+        mask &= (dates >= np.datetime64(date_range[0])) & (dates <= np.datetime64(date_range[1]))
+    
+    if state != 'All':
+        mask &= (df['state'] == state).to_numpy()
+    
+    if city != 'All':
+        mask &= (df['merchant_city'] == city).to_numpy()
+    
+    if channel != 'All':
+        mask &= (df['channel'] == channel).to_numpy()
+    
+    if risk != 'All':
+        mask &= (df['risk_label'] == risk).to_numpy()
+    
+    if search:
+        mask &= (
+            df['transaction_id'].str.contains(search, case=False, na=False) |
+            df['merchant_name'].str.contains(search, case=False, na=False)
+        ).to_numpy()
+    
+    return df.loc[mask]
+
+
+@st.cache_resource(max_entries=4)
+def apply_filters(df_key, _df, state='All', city='All', channel='All', risk='All',
+                  search='', date_range=None):
+    """
+    Cached version of filter_transactions, keyed on the dataset key and the
+    filter values (the DataFrame itself is not hashed). Changing page or
+    selecting a transaction reuses the filtered data instead of rebuilding it.
+    
+    cache_resource hands back the cached DataFrame itself rather than an
+    unpickled copy, so a cache hit costs nothing. Callers must not modify
+    the result. Each entry can hold most of a large upload, so only a few
+    are kept.
+    """
+    return filter_transactions(_df, state=state, city=city, channel=channel, risk=risk,
+                               search=search, date_range=date_range)
+
+
 # ============================================================================
 # PAGE FUNCTIONS
 # ============================================================================
@@ -315,7 +661,7 @@ def show_home_page():
             st.metric("Total Transactions", len(df))
         
         with col2:
-            st.metric("Total Amount", f"₹{df['amount_in_inr'].sum():,.0f}")
+            st.metric("Total Amount", f"₹{total_amount(df):,.0f}")
         
         with col3:
             fraud_count = df[df['is_fraud'] == 1].shape[0]
@@ -344,19 +690,20 @@ def show_dataset_page():
         uploaded_file = st.file_uploader("Or Upload Your CSV", type=['csv'])
         if uploaded_file is not None:
             try:
-                df = pd.read_csv(uploaded_file)
-                df['transaction_datetime'] = pd.to_datetime(df['transaction_datetime'])
-                df = process_transactions(df)
-                st.session_state['custom_data'] = df
+                # Hash and score the upload only when a new file arrives,
+                # not on every rerun while it stays in the uploader
+                if st.session_state.get('custom_data_file_id') != uploaded_file.file_id:
+                    data = uploaded_file.getvalue()
+                    df_key = dataset_key(data)
+                    st.session_state['custom_data'] = process_csv_bytes(df_key, data)
+                    st.session_state['custom_data_key'] = df_key
+                    st.session_state['custom_data_file_id'] = uploaded_file.file_id
                 st.session_state['data_loaded'] = True
                 st.success("Custom data uploaded successfully!")
             except Exception as e:
                 st.error(f"Error loading file: {e}")
     
-    if 'custom_data' in st.session_state:
-        df = st.session_state['custom_data']
-    else:
-        df = load_sample_data()
+    df, df_key = get_active_dataset()
     
     if df is None:
         st.warning("Please load the sample dataset or upload a CSV file.")
@@ -370,7 +717,7 @@ def show_dataset_page():
         st.metric("Total Transactions", f"{len(df):,}")
     
     with col2:
-        st.metric("Total Amount", f"₹{df['amount_in_inr'].sum():,.2f}")
+        st.metric("Total Amount", f"₹{total_amount(df):,.2f}")
     
     with col3:
         st.metric("Unique Customers", df['customer_id'].nunique())
@@ -384,15 +731,15 @@ def show_dataset_page():
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        states = ['All'] + sorted(df['state'].unique().tolist())
+        states = filter_options(df, 'state')
         selected_state = st.selectbox("State", states)
     
     with col2:
-        cities = ['All'] + sorted(df['merchant_city'].unique().tolist())
+        cities = filter_options(df, 'merchant_city')
         selected_city = st.selectbox("City", cities)
     
     with col3:
-        channels = ['All'] + sorted(df['channel'].unique().tolist())
+        channels = filter_options(df, 'channel')
         selected_channel = st.selectbox("Channel", channels)
     
     with col4:
@@ -401,25 +748,9 @@ def show_dataset_page():
     
     search_query = st.text_input("Search by Transaction ID or Merchant Name")
     
-    filtered_df = df.copy()
-    
-    if selected_state != 'All':
-        filtered_df = filtered_df[filtered_df['state'] == selected_state]
-    
-    if selected_city != 'All':
-        filtered_df = filtered_df[filtered_df['merchant_city'] == selected_city]
-    
-    if selected_channel != 'All':
-        filtered_df = filtered_df[filtered_df['channel'] == selected_channel]
-    
-    if selected_risk != 'All':
-        filtered_df = filtered_df[filtered_df['risk_label'] == selected_risk]
-    
-    if search_query:
-        filtered_df = filtered_df[
-            (filtered_df['transaction_id'].str.contains(search_query, case=False)) |
-            (filtered_df['merchant_name'].str.contains(search_query, case=False))
-        ]
+    filtered_df = apply_filters(df_key, df, state=selected_state, city=selected_city,
+                                channel=selected_channel, risk=selected_risk,
+                                search=search_query)
     
     st.info(f"Showing {len(filtered_df)} of {len(df)} transactions")
     
@@ -427,18 +758,14 @@ def show_dataset_page():
     
     display_df = filtered_df[['transaction_id', 'card_last4', 'transaction_datetime', 
                               'amount_in_inr', 'merchant_name', 'merchant_city', 'state',
-                              'channel', 'risk_score', 'risk_label', 'is_fraud']].copy()
-    
-    display_df['amount_in_inr'] = display_df['amount_in_inr'].apply(lambda x: f"₹{x:,.2f}")
-    display_df['card_last4'] = display_df['card_last4'].apply(lambda x: f"****{x}")
+                              'channel', 'risk_score', 'risk_label', 'is_fraud']]
     
-    def highlight_risk(val):
-        if val == 'High Risk':
-            return 'background-color: #ffcccc'
-        elif val == 'Suspicious':
-            return 'background-color: #fff3cd'
-        else:
-            return 'background-color: #d4edda'
+    def highlight_risk(labels):
+        return np.select(
+            [labels == 'High Risk', labels == 'Suspicious'],
+            ['background-color: #ffcccc', 'background-color: #fff3cd'],
+            default='background-color: #d4edda'
+        )
     
     page_size = 20
     total_pages = max(1, len(display_df) // page_size + (1 if len(display_df) % page_size > 0 else 0))
@@ -450,8 +777,12 @@ def show_dataset_page():
     start_idx = (page - 1) * page_size
     end_idx = start_idx + page_size
     
+    # Formatting is applied by the Styler, so only the rows on this page are formatted
+    page_df = display_df.iloc[start_idx:end_idx]
     st.dataframe(
-        display_df.iloc[start_idx:end_idx].style.applymap(highlight_risk, subset=['risk_label']),
+        page_df.style
+        .format({'amount_in_inr': '₹{:,.2f}', 'card_last4': '****{}'})
+        .apply(highlight_risk, subset=['risk_label']),
         use_container_width=True,
         height=500
     )
@@ -461,12 +792,14 @@ def show_dataset_page():
     st.markdown('<h2 class="section-header">Transaction Detail View</h2>', unsafe_allow_html=True)
     
     selected_txn = st.selectbox(
-        "Select a transaction to view details:",
-        filtered_df['transaction_id'].tolist()
+        "Select a transaction on this page to view details:",
+        page_df['transaction_id'].tolist()
     )
     
     if selected_txn:
-        txn = df[df['transaction_id'] == selected_txn].iloc[0]
+        # The selected ID is on this page, so only the page rows are searched
+        page_rows = filtered_df.iloc[start_idx:end_idx]
+        txn = page_rows.loc[page_rows['transaction_id'] == selected_txn].iloc[0]
         
         col1, col2 = st.columns(2)
         
@@ -497,8 +830,9 @@ def show_dataset_page():
             st.write("")
             st.subheader("Triggered Rules")
             
-            if txn['triggered_rules']:
-                for rule in txn['triggered_rules']:
+            triggered_rules = describe_triggered_rules(txn)
+            if triggered_rules:
+                for rule in triggered_rules:
                     st.warning(f"{rule}")
             else:
                 st.success("No suspicious patterns detected")
@@ -514,10 +848,7 @@ def show_dashboard_page():
     
     st.markdown('<h1 class="main-header">Fraud Analytics Dashboard</h1>', unsafe_allow_html=True)
     
-    if 'custom_data' in st.session_state:
-        df = st.session_state['custom_data']
-    else:
-        df = load_sample_data()
+    df, df_key = get_active_dataset()
     
     if df is None:
         st.warning("Please load the dataset first from the Dataset page.")
@@ -528,45 +859,33 @@ def show_dashboard_page():
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        min_date = df['transaction_datetime'].min().date()
-        max_date = df['transaction_datetime'].max().date()
+        min_date = df['date'].min().date()
+        max_date = df['date'].max().date()
         date_range = st.date_input("Date Range", [min_date, max_date])
     
     with col2:
-        states = ['All'] + sorted(df['state'].unique().tolist())
+        states = filter_options(df, 'state')
         selected_state = st.selectbox("State", states, key='dash_state')
     
     with col3:
-        channels = ['All'] + sorted(df['channel'].unique().tolist())
+        channels = filter_options(df, 'channel')
         selected_channel = st.selectbox("Channel", channels, key='dash_channel')
     
     with col4:
         risk_levels = ['All', 'High Risk', 'Suspicious', 'Normal']
         selected_risk = st.selectbox("Risk Level", risk_levels, key='dash_risk')
     
-    filtered_df = df.copy()
-    
-    if len(date_range) == 2:
-        filtered_df = filtered_df[
-            (filtered_df['transaction_datetime'].dt.date >= date_range[0]) &
-            (filtered_df['transaction_datetime'].dt.date <= date_range[1])
-        ]
-    
-    if selected_state != 'All':
-        filtered_df = filtered_df[filtered_df['state'] == selected_state]
-    
-    if selected_channel != 'All':
-        filtered_df = filtered_df[filtered_df['channel'] == selected_channel]
-    
-    if selected_risk != 'All':
-        filtered_df = filtered_df[filtered_df['risk_label'] == selected_risk]
+    filtered_df = apply_filters(df_key, df, state=selected_state, channel=selected_channel,
+                                risk=selected_risk, date_range=tuple(date_range))
     
     st.markdown('<h2 class="section-header">Key Metrics</h2>', unsafe_allow_html=True)
     
     col1, col2, col3, col4 = st.columns(4)
     
+    fraud_rows = (filtered_df['is_fraud'] == 1).to_numpy()
+    
     total_txns = len(filtered_df)
-    fraud_txns = filtered_df[filtered_df['is_fraud'] == 1].shape[0]
+    fraud_txns = int(fraud_rows.sum())
     fraud_pct = (fraud_txns / total_txns * 100) if total_txns > 0 else 0
     max_amount = filtered_df['amount_in_inr'].max() if len(filtered_df) > 0 else 0
     
@@ -589,7 +908,7 @@ def show_dashboard_page():
     with col1:
         fraud_counts = filtered_df['is_fraud'].value_counts().reset_index()
         fraud_counts.columns = ['Type', 'Count']
-        fraud_counts['Type'] = fraud_counts['Type'].map({0: 'Genuine', 1: 'Fraud'})
+        fraud_counts['Type'] = fraud_counts['Type'].astype(bool).map({False: 'Genuine', True: 'Fraud'})
         
         fig1 = px.bar(
             fraud_counts, 
@@ -603,13 +922,14 @@ def show_dashboard_page():
         st.plotly_chart(fig1, use_container_width=True)
     
     with col2:
-        channel_fraud = filtered_df[filtered_df['is_fraud'] == 1].groupby('channel').size().reset_index(name='Count')
+        channel_fraud = filtered_df.loc[fraud_rows, 'channel'].value_counts()
+        channel_fraud = channel_fraud[channel_fraud > 0]
         
         if len(channel_fraud) > 0:
             fig2 = px.pie(
-                channel_fraud,
-                values='Count',
-                names='channel',
+                values=channel_fraud.values,
+                names=channel_fraud.index,
+                labels={'values': 'Count', 'names': 'channel'},
                 title='Fraud Distribution by Channel',
                 color_discrete_sequence=px.colors.qualitative.Set2
             )
@@ -620,17 +940,18 @@ def show_dashboard_page():
     col1, col2 = st.columns(2)
     
     with col1:
-        state_fraud = filtered_df[filtered_df['is_fraud'] == 1].groupby('state').size().reset_index(name='Count')
-        state_fraud = state_fraud.sort_values('Count', ascending=True).tail(10)
+        state_fraud = filtered_df.loc[fraud_rows, 'state'].value_counts()
+        # value_counts sorts descending; reverse the top 10 so the largest bar is on top
+        state_fraud = state_fraud[state_fraud > 0].head(10)[::-1]
         
         if len(state_fraud) > 0:
             fig3 = px.bar(
-                state_fraud,
-                y='state',
-                x='Count',
+                y=state_fraud.index,
+                x=state_fraud.values,
+                labels={'x': 'Count', 'y': 'state', 'color': 'Count'},
                 orientation='h',
                 title='Top States by Fraud Cases',
-                color='Count',
+                color=state_fraud.values,
                 color_continuous_scale='Reds'
             )
             st.plotly_chart(fig3, use_container_width=True)
@@ -638,14 +959,13 @@ def show_dashboard_page():
             st.info("No fraud cases in selected filters")
     
     with col2:
-        filtered_df['date'] = filtered_df['transaction_datetime'].dt.date
-        fraud_over_time = filtered_df[filtered_df['is_fraud'] == 1].groupby('date').size().reset_index(name='Count')
+        fraud_over_time = filtered_df.loc[fraud_rows, 'date'].value_counts().sort_index()
         
         if len(fraud_over_time) > 0:
             fig4 = px.line(
-                fraud_over_time,
-                x='date',
-                y='Count',
+                x=fraud_over_time.index,
+                y=fraud_over_time.values,
+                labels={'x': 'date', 'y': 'Count'},
                 title='Fraud Transactions Over Time',
                 markers=True
             )
@@ -656,7 +976,9 @@ def show_dashboard_page():
     
     st.markdown('<h3>Risk Level Distribution</h3>', unsafe_allow_html=True)
     
-    risk_dist = filtered_df['risk_label'].value_counts().reset_index()
+    # risk_label is categorical, so drop the levels the filters left empty
+    risk_dist = filtered_df['risk_label'].value_counts()
+    risk_dist = risk_dist[risk_dist > 0].reset_index()
     risk_dist.columns = ['Risk Level', 'Count']
     
     fig5 = px.bar(
@@ -673,35 +995,45 @@ def show_dashboard_page():
     col1, col2 = st.columns(2)
     
     with col1:
-        fig6 = px.box(
-            filtered_df,
-            x='is_fraud',
-            y='amount_in_inr',
-            color='is_fraud',
-            labels={'is_fraud': 'Transaction Type', 'amount_in_inr': 'Amount (₹)'},
+        # Send Plotly five summary values per group instead of every amount
+        amount_stats = filtered_df.groupby('is_fraud')['amount_in_inr'].describe()
+        
+        fig6 = go.Figure([
+            go.Box(
+                name='Fraud' if is_fraud else 'Genuine',
+                lowerfence=[stats['min']],
+                q1=[stats['25%']],
+                median=[stats['50%']],
+                q3=[stats['75%']],
+                upperfence=[stats['max']],
+                marker_color='#dc3545' if is_fraud else '#28a745'
+            )
+            for is_fraud, stats in amount_stats.iterrows()
+        ])
+        fig6.update_layout(
             title='Amount Distribution: Fraud vs Genuine',
-            color_discrete_map={0: '#28a745', 1: '#dc3545'}
+            xaxis_title='Transaction Type',
+            yaxis_title='Amount (₹)',
+            showlegend=False
         )
-        fig6.update_xaxes(ticktext=['Genuine', 'Fraud'], tickvals=[0, 1])
         st.plotly_chart(fig6, use_container_width=True)
     
     with col2:
-        category_fraud = filtered_df.groupby('merchant_category').agg({
-            'is_fraud': 'sum',
-            'transaction_id': 'count'
-        }).reset_index()
-        category_fraud.columns = ['Category', 'Fraud Count', 'Total']
-        category_fraud = category_fraud.sort_values('Fraud Count', ascending=False).head(8)
+        category_fraud = filtered_df.loc[fraud_rows, 'merchant_category'].value_counts()
+        category_fraud = category_fraud[category_fraud > 0].head(8)
         
-        fig7 = px.bar(
-            category_fraud,
-            x='Category',
-            y='Fraud Count',
-            title='Fraud Cases by Merchant Category',
-            color='Fraud Count',
-            color_continuous_scale='Oranges'
-        )
-        st.plotly_chart(fig7, use_container_width=True)
+        if len(category_fraud) > 0:
+            fig7 = px.bar(
+                x=category_fraud.index,
+                y=category_fraud.values,
+                labels={'x': 'Category', 'y': 'Fraud Count', 'color': 'Fraud Count'},
+                title='Fraud Cases by Merchant Category',
+                color=category_fraud.values,
+                color_continuous_scale='Oranges'
+            )
+            st.plotly_chart(fig7, use_container_width=True)
+        else:
+            st.info("No fraud cases in selected filters")
 
 
 # ============================================================================
@@ -0,0 +1,82 @@
+"""
+Rule Evaluation Kernel
+======================
+
+Evaluates the five fraud detection rules over whole NumPy columns and
+writes a risk score and a rule bitmask for every transaction.
+
+The loop is compiled with Numba when it is installed. It lives in its own
+module because Numba can only cache functions that belong to an importable
+module, which the Streamlit script itself is not.
+"""
+
+import numpy as np
+
+# Numba is optional: without it the rules fall back to plain NumPy masks
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Bit flags recording which rules a transaction triggered
+RULE_HIGH_AMOUNT = 1
+RULE_INTERNATIONAL = 2
+RULE_LATE_NIGHT_ONLINE = 4
+RULE_VELOCITY = 8
+RULE_SUSPICIOUS_MERCHANT = 16
+
+
+def _score_rules_numpy(amount, international, hour, online, customer_txn_count,
+                       suspicious, out_score, out_mask):
+    """Evaluate the five rules with NumPy masks (used when Numba is missing)."""
+    high_amount = amount > 20000
+    late_night_online = online & (hour < 4)
+    velocity = customer_txn_count > 3
+    
+    out_score[:] = np.minimum(
+        30 * high_amount + 25 * international + 20 * late_night_online
+        + 15 * velocity + 10 * suspicious,
+        100
+    )
+    out_mask[:] = (
+        RULE_HIGH_AMOUNT * high_amount + RULE_INTERNATIONAL * international
+        + RULE_LATE_NIGHT_ONLINE * late_night_online + RULE_VELOCITY * velocity
+        + RULE_SUSPICIOUS_MERCHANT * suspicious
+    )
+
+
+def _score_rules_loop(amount, international, hour, online, customer_txn_count,
+                      suspicious, out_score, out_mask):
+    """Evaluate the five rules in one pass per row (compiled by Numba)."""
+    for i in range(amount.size):
+        score = 0
+        mask = 0
+        if amount[i] > 20000:
+            score += 30
+            mask |= RULE_HIGH_AMOUNT
+        if international[i]:
+            score += 25
+            mask |= RULE_INTERNATIONAL
+        if online[i] and hour[i] < 4:
+            score += 20
+            mask |= RULE_LATE_NIGHT_ONLINE
+        if customer_txn_count[i] > 3:
+            score += 15
+            mask |= RULE_VELOCITY
+        if suspicious[i]:
+            score += 10
+            mask |= RULE_SUSPICIOUS_MERCHANT
+        out_score[i] = min(score, 100)
+        out_mask[i] = mask
+
+
+# Compiled lazily and cached on disk, so Streamlit reruns that hit the data
+# cache never pay for compilation. The loop is memory-bound and runs serially:
+# Streamlit scores each session in its own thread, and Numba's default
+# workqueue threading layer aborts the process when two parallel kernels
+# run at once.
+if NUMBA_AVAILABLE:
+    score_rules = njit(cache=True)(_score_rules_loop)
+else:
+    score_rules = _score_rules_numpy
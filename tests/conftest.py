@@ -0,0 +1,36 @@
+"""
+Shared fixtures for the app tests.
+"""
+
+import csv
+import io
+
+import pytest
+
+import app
+
+
+@pytest.fixture
+def sample_csv():
+    """
+    Build an in-memory copy of the sample CSV. The returned function takes
+    an optional rewrite callable, which receives every row as a dict and
+    may change its fields in place. Rows are parsed and written with the
+    csv module, so quoted fields survive the round trip.
+    """
+    def build(rewrite=None):
+        with open(app.SAMPLE_DATA_CSV, newline='', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            rows = list(reader)
+
+        if rewrite is not None:
+            for row in rows:
+                rewrite(row)
+
+        out = io.StringIO()
+        writer = csv.DictWriter(out, fieldnames=reader.fieldnames, lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(rows)
+        return io.BytesIO(out.getvalue().encode('utf-8'))
+
+    return build
@@ -0,0 +1,23 @@
+"""
+Tests for the page filters in app.py.
+
+Run from the repository root with: python -m pytest
+"""
+
+import datetime
+
+import app
+
+
+def test_date_filter_accepts_timezone_aware_datetimes(sample_csv):
+    def add_ist_offset(row):
+        # ISO 8601 with an IST offset
+        row['transaction_datetime'] = row['transaction_datetime'].replace(' ', 'T') + '+05:30'
+
+    df = app.read_transactions_csv(sample_csv(add_ist_offset))
+    day = datetime.date(2024, 1, 15)
+    filtered = app.filter_transactions(df, date_range=(day, day))
+
+    expected = df['transaction_datetime'].dt.date == day
+    assert expected.any()
+    assert filtered['transaction_id'].tolist() == df.loc[expected, 'transaction_id'].tolist()
@@ -0,0 +1,53 @@
+"""
+Tests for the rule-based risk scoring in app.py.
+
+Run from the repository root with: python -m pytest
+"""
+
+import app
+from rule_kernel import RULE_LATE_NIGHT_ONLINE
+
+
+def score(source):
+    """Parse and score a transactions CSV."""
+    return app.process_transactions(app.read_transactions_csv(source))
+
+
+def blank_txn001_datetime(row):
+    if row['transaction_id'] == 'TXN001':
+        row['transaction_datetime'] = ''
+
+
+def test_missing_datetime_does_not_trigger_late_night_rule(sample_csv):
+    df = score(sample_csv(blank_txn001_datetime))
+    txn = df.loc[df['transaction_id'] == 'TXN001'].iloc[0]
+
+    # TXN001 is an Online transaction that triggers no other rule
+    assert txn['channel'] == 'Online'
+    assert txn['risk_score'] == 0
+    assert not txn['rule_mask'] & RULE_LATE_NIGHT_ONLINE
+    assert app.describe_triggered_rules(txn) == []
+
+
+def test_missing_datetime_leaves_other_scores_unchanged(sample_csv):
+    expected = score(sample_csv())
+    df = score(sample_csv(blank_txn001_datetime))
+
+    assert df['risk_score'].tolist() == expected['risk_score'].tolist()
+    assert df['rule_mask'].tolist() == expected['rule_mask'].tolist()
+
+
+def test_numeric_international_flags_score_like_booleans(sample_csv):
+    def numeric_flags(row):
+        # 0/1 flags with one blank cell, which pandas parses as float
+        if row['transaction_id'] == 'TXN001':
+            row['is_international'] = ''
+        else:
+            row['is_international'] = '1' if row['is_international'] == 'True' else '0'
+
+    expected = score(sample_csv())
+    df = score(sample_csv(numeric_flags))
+
+    assert df['is_international'].dtype == float
+    assert df['risk_score'].tolist() == expected['risk_score'].tolist()
+    assert df['rule_mask'].tolist() == expected['rule_mask'].tolist()